@@ -7,9 +7,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 # from homeassistant.const import Platform # No longer creating platform entities directly
 
-from .const import DOMAIN
+from .const import DOMAIN, SCHEDULE_OPTION_KEYS
 # --- Ensure this import works ---
-from .mqtt_publisher import VPDCalculatorMqttPublisher
+from .mqtt_publisher import VPDCalculatorMqttPublisher, async_remove_discovery
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +26,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # --- Call its setup method ---
         await publisher.async_setup()
 
+        # --- Follow options flow changes (schedule in place, everything else via reload) ---
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     except Exception as err: # Add error handling during setup
         _LOGGER.exception("Failed to set up VPD publisher for %s: %s", entry.entry_id, err)
         return False # Indicate setup failure
@@ -33,6 +36,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True # Indicate setup success
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options: schedule changes in place, anything else by reloading the entry."""
+    publisher = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if publisher:
+        # Threshold commands and the discovery migration only write entry.data; ignore those
+        old_options = publisher.loaded_options
+        changed = {key for key in old_options.keys() | entry.options.keys()
+                   if old_options.get(key) != entry.options.get(key)}
+        if not changed:
+            return
+        if changed <= SCHEDULE_OPTION_KEYS:
+            await publisher.async_update_schedule(entry)
+            return
+    _LOGGER.info("Options changed for VPD Calculator entry %s, reloading", entry.entry_id)
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading VPD Calculator entry %s (MQTT)", entry.entry_id)
@@ -55,4 +75,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
          _LOGGER.warning("Force removed publisher data for %s after unload failure.", entry.entry_id)
          return False # Still report failure
 
-    return unload_ok # Return actual unload status
\ No newline at end of file
+    return unload_ok # Return actual unload status
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the MQTT entities when the config entry is deleted."""
+    # Done here rather than on unload so reloads keep entity customisations
+    try:
+        await async_remove_discovery(hass, entry.entry_id)
+    except Exception as err:
+        _LOGGER.warning("Failed to clear MQTT discovery for %s: %s", entry.entry_id, err)
@@ -22,7 +22,18 @@ from .const import (
     DEFAULT_THRESHOLD_MIN_LIMIT,
     DEFAULT_THRESHOLD_MAX_LIMIT,
     DEFAULT_THRESHOLD_STEP,
+    CONF_KEY_GROWTH_STAGE,
+    CONF_KEY_LIGHTS_ON,
+    CONF_KEY_LIGHTS_OFF,
+    CONF_KEY_SCHEDULE,
+    GROWTH_STAGES,
+    GROWTH_STAGE_OFF,
+    DEFAULT_LIGHTS_ON,
+    DEFAULT_LIGHTS_OFF,
+    DEFAULT_VPD_SCHEDULE,
+    CONF_KEY_DEVICE_DISCOVERY_MIGRATED,
 )
+from .scheduler import parse_light_times, parse_stage_thresholds
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,8 +78,30 @@ STEP_THRESHOLDS_DATA_SCHEMA = vol.Schema(
                 mode="box"
             ),
         ),
+        vol.Optional(CONF_KEY_GROWTH_STAGE, default=GROWTH_STAGE_OFF): selector.SelectSelector(
+            selector.SelectSelectorConfig(options=GROWTH_STAGES, translation_key=CONF_KEY_GROWTH_STAGE),
+        ),
+        vol.Optional(CONF_KEY_LIGHTS_ON, default=DEFAULT_LIGHTS_ON): selector.TimeSelector(),
+        vol.Optional(CONF_KEY_LIGHTS_OFF, default=DEFAULT_LIGHTS_OFF): selector.TimeSelector(),
+        vol.Optional(CONF_KEY_SCHEDULE, default=DEFAULT_VPD_SCHEDULE): selector.ObjectSelector(),
      }
 )
+
+def _validate_schedule(data: dict[str, Any]) -> str | None:
+    """Return an error key if the selected growth stage schedule can't be applied."""
+    stage = data.get(CONF_KEY_GROWTH_STAGE, GROWTH_STAGE_OFF)
+    if stage == GROWTH_STAGE_OFF:
+        return None
+    try:
+        parse_light_times(data)
+    except ValueError:
+        return "lights_invalid"
+    try:
+        parse_stage_thresholds(data, stage)
+    except ValueError:
+        return "schedule_invalid"
+    return None
+
 # --- Config Flow ---
 class VPDCalculatorConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for VPD Calculator."""
@@ -82,6 +115,10 @@ class VPDCalculatorConfigFlow(ConfigFlow, domain=DOMAIN):
         """Get the options flow for this handler."""
         return VPDCalculatorOptionsFlow(config_entry)
 
+    def _entry_data(self) -> dict[str, Any]:
+        """Config entry data; new entries start on device discovery and need no migration."""
+        return {**self.config_data, CONF_KEY_DEVICE_DISCOVERY_MIGRATED: True}
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -97,7 +134,7 @@ class VPDCalculatorConfigFlow(ConfigFlow, domain=DOMAIN):
             else:
                 # If no, finish the flow now
                 _LOGGER.info("Creating VPD Calculator entry (no thresholds): %s", self.config_data)
-                return self.async_create_entry(title=self.config_data["name"], data=self.config_data)
+                return self.async_create_entry(title=self.config_data["name"], data=self._entry_data())
 
         # Show the initial form
         return self.async_show_form(
@@ -118,13 +155,16 @@ class VPDCalculatorConfigFlow(ConfigFlow, domain=DOMAIN):
             max_val = self.config_data.get(CONF_KEY_INITIAL_MAX_THRESHOLD, DEFAULT_MAX_THRESHOLD)
             if min_val >= max_val:
                  errors["base"] = "min_max_invalid" # Error key defined in strings.json
+            elif schedule_error := _validate_schedule(self.config_data):
+                 errors["base"] = schedule_error
+            if errors:
                  # Show form again with error
                  return self.async_show_form(
                     step_id="thresholds", data_schema=STEP_THRESHOLDS_DATA_SCHEMA, errors=errors
                  )
 
             # Create the config entry
-            return self.async_create_entry(title=self.config_data["name"], data=self.config_data)
+            return self.async_create_entry(title=self.config_data["name"], data=self._entry_data())
 
         # Show the threshold defaults form
         return self.async_show_form(
@@ -139,8 +179,8 @@ class VPDCalculatorOptionsFlow(OptionsFlow):
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
         # self.config_entry = config_entry
-        # Store options - start with current config entry data
-        self.options = dict(config_entry.data)
+        # Store options - start with what is running: entry data overlaid with saved options
+        self.options = {**config_entry.data, **config_entry.options}
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
@@ -187,6 +227,9 @@ class VPDCalculatorOptionsFlow(OptionsFlow):
             max_val = self.options.get(CONF_KEY_INITIAL_MAX_THRESHOLD, DEFAULT_MAX_THRESHOLD)
             if min_val >= max_val:
                  errors["base"] = "min_max_invalid"
+            elif schedule_error := _validate_schedule(self.options):
+                 errors["base"] = schedule_error
+            if errors:
                  # Show form again if error
                  threshold_schema = self._get_threshold_options_schema()
                  return self.async_show_form(step_id="thresholds_options", data_schema=threshold_schema, errors=errors)
@@ -212,4 +255,19 @@ class VPDCalculatorOptionsFlow(OptionsFlow):
             ): selector.NumberSelector(
                  selector.NumberSelectorConfig(min=DEFAULT_THRESHOLD_MIN_LIMIT, max=DEFAULT_THRESHOLD_MAX_LIMIT, step=DEFAULT_THRESHOLD_STEP, mode="box")
             ),
+            vol.Optional(
+                CONF_KEY_GROWTH_STAGE,
+                default=self.options.get(CONF_KEY_GROWTH_STAGE, GROWTH_STAGE_OFF)
+            ): selector.SelectSelector(
+                 selector.SelectSelectorConfig(options=GROWTH_STAGES, translation_key=CONF_KEY_GROWTH_STAGE)
+            ),
+            vol.Optional(
+                CONF_KEY_LIGHTS_ON, default=self.options.get(CONF_KEY_LIGHTS_ON, DEFAULT_LIGHTS_ON)
+            ): selector.TimeSelector(),
+            vol.Optional(
+                CONF_KEY_LIGHTS_OFF, default=self.options.get(CONF_KEY_LIGHTS_OFF, DEFAULT_LIGHTS_OFF)
+            ): selector.TimeSelector(),
+            vol.Optional(
+                CONF_KEY_SCHEDULE, default=self.options.get(CONF_KEY_SCHEDULE, DEFAULT_VPD_SCHEDULE)
+            ): selector.ObjectSelector(),
          })
\ No newline at end of file
@@ -15,4 +15,39 @@ DEFAULT_MIN_THRESHOLD = 0.85
 DEFAULT_MAX_THRESHOLD = 1.15
 DEFAULT_THRESHOLD_MIN_LIMIT = 0.1 # Renamed for clarity (limit for the number entity)
 DEFAULT_THRESHOLD_MAX_LIMIT = 2.5 # Renamed for clarity (limit for the number entity)
-DEFAULT_THRESHOLD_STEP = 0.01
\ No newline at end of file
+DEFAULT_THRESHOLD_STEP = 0.01
+# --- Threshold Schedule (growth stage + day/night) ---
+DATA_SCHEDULER = f"{DOMAIN}_scheduler" # hass.data key for the shared boundary timer
+CONF_KEY_GROWTH_STAGE = "growth_stage"
+CONF_KEY_LIGHTS_ON = "lights_on"
+CONF_KEY_LIGHTS_OFF = "lights_off"
+CONF_KEY_SCHEDULE = "vpd_schedule"
+# Options that can be applied to a running instance without a reload
+SCHEDULE_OPTION_KEYS = {CONF_KEY_GROWTH_STAGE, CONF_KEY_LIGHTS_ON, CONF_KEY_LIGHTS_OFF, CONF_KEY_SCHEDULE}
+GROWTH_STAGE_OFF = "off" # Schedule disabled, thresholds only change via the sliders
+GROWTH_STAGES = [GROWTH_STAGE_OFF, "seedling", "vegetative", "flowering", "late_flowering"]
+DEFAULT_LIGHTS_ON = "06:00:00"
+DEFAULT_LIGHTS_OFF = "00:00:00"
+# Per stage min/max (kPa) while lights are on ("day") and off ("night")
+DEFAULT_VPD_SCHEDULE = {
+    "seedling": {
+        "day": {CONF_KEY_MIN_THRESHOLD: 0.4, CONF_KEY_MAX_THRESHOLD: 0.8},
+        "night": {CONF_KEY_MIN_THRESHOLD: 0.3, CONF_KEY_MAX_THRESHOLD: 0.6},
+    },
+    "vegetative": {
+        "day": {CONF_KEY_MIN_THRESHOLD: 0.8, CONF_KEY_MAX_THRESHOLD: 1.1},
+        "night": {CONF_KEY_MIN_THRESHOLD: 0.6, CONF_KEY_MAX_THRESHOLD: 0.9},
+    },
+    "flowering": {
+        "day": {CONF_KEY_MIN_THRESHOLD: 1.0, CONF_KEY_MAX_THRESHOLD: 1.5},
+        "night": {CONF_KEY_MIN_THRESHOLD: 0.8, CONF_KEY_MAX_THRESHOLD: 1.2},
+    },
+    "late_flowering": {
+        "day": {CONF_KEY_MIN_THRESHOLD: 1.2, CONF_KEY_MAX_THRESHOLD: 1.6},
+        "night": {CONF_KEY_MIN_THRESHOLD: 1.0, CONF_KEY_MAX_THRESHOLD: 1.3},
+    },
+}
+
+# --- MQTT Discovery ---
+# Set once the legacy per-entity discovery topics were migrated to device-based discovery
+CONF_KEY_DEVICE_DISCOVERY_MIGRATED = "device_discovery_migrated"
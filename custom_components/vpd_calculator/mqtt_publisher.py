@@ -3,6 +3,7 @@
 """Handles VPD Calculation and MQTT Publishing for Sensor and Optional Thresholds."""
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import math
@@ -24,10 +25,11 @@ from homeassistant.const import (
     STATE_UNKNOWN,
     UnitOfPressure,
 )
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceRegistry, async_get as async_get_device_registry
 from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
 # from homeassistant.helpers.restore_state import RestoreEntity # Not using yet
 
 from .const import (
@@ -43,6 +45,15 @@ from .const import (
     DEFAULT_THRESHOLD_MIN_LIMIT,
     DEFAULT_THRESHOLD_MAX_LIMIT,
     DEFAULT_THRESHOLD_STEP,
+    CONF_KEY_GROWTH_STAGE,
+    GROWTH_STAGE_OFF,
+    CONF_KEY_DEVICE_DISCOVERY_MIGRATED,
+)
+from .scheduler import (
+    async_get_schedule_manager,
+    parse_light_times,
+    parse_stage_thresholds,
+    seconds_of_day,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,9 +70,40 @@ DEFAULT_DEVICE_INFO = {
 }
 # ---------------------------------------------------------
 
-# MQTT Discovery settings - Sensor
+DISCOVERY_DEVICE_TOPIC = "homeassistant/device/{}/config"
+
+# Origin block, required by device-based MQTT discovery
+DISCOVERY_ORIGIN = {
+    "name": "VPD Calculator",
+    "support_url": "https://github.com/YeonV/ha-vpd-calculator",
+}
+
+# --- Pre-encoded MQTT payloads (bytes skip per-publish encoding) ---
+PAYLOAD_ONLINE = "online"
+PAYLOAD_OFFLINE = "offline"
+PAYLOAD_ONLINE_BYTES = PAYLOAD_ONLINE.encode()
+PAYLOAD_OFFLINE_BYTES = PAYLOAD_OFFLINE.encode()
+PAYLOAD_EMPTY = b""
+MIGRATE_DISCOVERY_PAYLOAD = '{"migrate_discovery": true}'
+
+# Formatted VPD payloads keyed by the value in hundredths of a kPa (outputs are quantized to 0.01)
+_KPA_PAYLOAD_CACHE: dict[int, bytes] = {}
+# Only plausible readings (0-10 kPa) are cached, so absurd sensor values can't grow the cache
+_KPA_PAYLOAD_CACHE_MAX = 1000
+
+# MQTT Discovery settings - Device (shared by all components of one instance)
+DISCOVERY_PAYLOAD_DEVICE_SCHEMA = {
+    "device": None, # Populated dynamically
+    "origin": DISCOVERY_ORIGIN,
+    "availability_topic": None,
+    "payload_available": PAYLOAD_ONLINE,
+    "payload_not_available": PAYLOAD_OFFLINE,
+    "components": None, # Populated dynamically
+}
+
+# MQTT Discovery settings - Sensor component
 DISCOVERY_PAYLOAD_SENSOR_SCHEMA = {
-    # ... (same as before) ...
+    "platform": "sensor",
     "name": None,
     "state_topic": None,
     "unique_id": None,
@@ -69,25 +111,17 @@ DISCOVERY_PAYLOAD_SENSOR_SCHEMA = {
     "device_class": SensorDeviceClass.PRESSURE,
     "state_class": SensorStateClass.MEASUREMENT,
     "value_template": "{{ value }}",
-    "device": None, # Populated dynamically
-    "availability_topic": None,
-    "payload_available": "online",
-    "payload_not_available": "offline",
     "enabled_by_default": True,
 }
 
-# MQTT Discovery settings - Number
+# MQTT Discovery settings - Number component
 DISCOVERY_PAYLOAD_NUMBER_SCHEMA = {
-    # ... (same as before) ...
+    "platform": "number",
     "name": None,
     "state_topic": None,
     "command_topic": None,
     "unique_id": None,
     "unit_of_measurement": UnitOfPressure.KPA,
-    "device": None, # Populated dynamically
-    "availability_topic": None,
-    "payload_available": "online",
-    "payload_not_available": "offline",
     "min": DEFAULT_THRESHOLD_MIN_LIMIT,
     "max": DEFAULT_THRESHOLD_MAX_LIMIT,
     "step": DEFAULT_THRESHOLD_STEP,
@@ -96,6 +130,47 @@ DISCOVERY_PAYLOAD_NUMBER_SCHEMA = {
 }
 
 
+def _kpa_payload(centi_kpa: int) -> bytes:
+    """Return the encoded state payload for a VPD given in hundredths of a kPa."""
+    payload = _KPA_PAYLOAD_CACHE.get(centi_kpa)
+    if payload is None:
+        payload = str(centi_kpa / 100).encode()
+        if 0 <= centi_kpa <= _KPA_PAYLOAD_CACHE_MAX:
+            _KPA_PAYLOAD_CACHE[centi_kpa] = payload
+    return payload
+
+
+def _source_value(state_obj: State | None) -> float | None:
+    """Return a source sensor state as float, or None if missing, unknown or not numeric."""
+    if state_obj is None:
+        return None
+    value = state_obj.state
+    if value in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class _RuntimeState:
+    """Mutable per-update state, slotted so the hot path never touches an instance dict."""
+
+    __slots__ = ("temp", "hum", "vpd_centi", "available")
+
+    def __init__(self) -> None:
+        """Initialize with no readings."""
+        self.temp: float | None = None
+        self.hum: float | None = None
+        self.vpd_centi: int | None = None # VPD in hundredths of a kPa
+        self.available = False
+
+
+async def async_remove_discovery(hass: HomeAssistant, entry_id: str) -> None:
+    """Clear the retained device discovery message, removing the sensor and threshold numbers."""
+    await mqtt.async_publish(hass, DISCOVERY_DEVICE_TOPIC.format(entry_id), PAYLOAD_EMPTY, qos=0, retain=True)
+
+
 class VPDCalculatorMqttPublisher:
     """Calculates VPD and publishes sensor and optional number entities via MQTT Discovery."""
 
@@ -103,32 +178,41 @@ class VPDCalculatorMqttPublisher:
         """Initialize the publisher."""
         self.hass = hass
         self.config_entry = config_entry
-        self.config_data = dict(config_entry.data) # Use mutable copy
         self.entry_id = config_entry.entry_id
+        config_data = config_entry.data # Read-only; persisted changes rebuild it on write
 
-        self._name = self.config_data["name"]
-        self._temp_id = self.config_data["temp_sensor"]
-        self._hum_id = self.config_data["humidity_sensor"]
-        self._delta = self.config_data["leaf_delta"]
-        self._target_device_id = self.config_data.get("target_device")
-        self._create_threshold_entities = self.config_data.get(CONF_KEY_CREATE_THRESHOLDS, True)
+        self._name = config_data["name"]
+        self._temp_id = config_data["temp_sensor"]
+        self._hum_id = config_data["humidity_sensor"]
+        self._delta = config_data["leaf_delta"]
+        self._target_device_id = config_data.get("target_device")
+        self._create_threshold_entities = config_data.get(CONF_KEY_CREATE_THRESHOLDS, True)
 
         # --- Internal State for Thresholds ---
         # Use initial values from config flow if present, else defaults
-        self._min_threshold = self.config_data.get(CONF_KEY_INITIAL_MIN_THRESHOLD, DEFAULT_MIN_THRESHOLD)
-        self._max_threshold = self.config_data.get(CONF_KEY_INITIAL_MAX_THRESHOLD, DEFAULT_MAX_THRESHOLD)
+        self._min_threshold = config_data.get(CONF_KEY_INITIAL_MIN_THRESHOLD, DEFAULT_MIN_THRESHOLD)
+        self._max_threshold = config_data.get(CONF_KEY_INITIAL_MAX_THRESHOLD, DEFAULT_MAX_THRESHOLD)
         # Store the *actual current* values (which might differ from initial if changed via MQTT)
         # For persistence across restarts without full config entry saving on every MQTT command,
         # we'd ideally use RestoreEntity, but let's stick to saving to config entry for now.
         # Load the *last known* values if they exist in the persistent data
-        self._min_threshold = self.config_data.get(CONF_KEY_MIN_THRESHOLD, self._min_threshold)
-        self._max_threshold = self.config_data.get(CONF_KEY_MAX_THRESHOLD, self._max_threshold)
+        self._min_threshold = config_data.get(CONF_KEY_MIN_THRESHOLD, self._min_threshold)
+        self._max_threshold = config_data.get(CONF_KEY_MAX_THRESHOLD, self._max_threshold)
+        # ------------------------------------
+        self._discovery_migrated = config_data.get(CONF_KEY_DEVICE_DISCOVERY_MIGRATED, False)
+
+        # --- Threshold Schedule (growth stage + day/night) ---
+        # Options flow results land in entry.options, so they take precedence over data
+        self.loaded_options = dict(config_entry.options) # Lets the update listener skip data-only writes
+        self._configure_schedule({**config_data, **config_entry.options})
         # ------------------------------------
 
         # MQTT Topics - Sensor (same)
         self._base_topic = f"{MQTT_PREFIX}/{self.entry_id}"
         self._sensor_state_topic = f"{self._base_topic}/state"
         self._sensor_availability_topic = f"{self._base_topic}/availability"
+        self._device_config_topic = DISCOVERY_DEVICE_TOPIC.format(self.entry_id)
+        # Legacy per-entity discovery topics, only used to migrate and clear them
         self._sensor_config_topic = f"homeassistant/sensor/{self.entry_id}/config"
         self._sensor_mqtt_unique_id = f"{self.entry_id}_vpd_mqtt"
 
@@ -145,10 +229,7 @@ class VPDCalculatorMqttPublisher:
 
         # Common State (same)
         self._device_block_for_mqtt = None
-        self._temp_state = None
-        self._hum_state = None
-        self._vpd_state = None
-        self._available = False
+        self._state = _RuntimeState()
         self._listeners = []
 
         _LOGGER.debug("[%s] Initialized MQTT Publisher (Thresholds: %s, Min: %s, Max: %s)",
@@ -182,38 +263,20 @@ class VPDCalculatorMqttPublisher:
         self._device_block_for_mqtt = device_block
 
 
-        # 2. Publish Discovery - VPD Sensor (Same as before)
-        sensor_payload = DISCOVERY_PAYLOAD_SENSOR_SCHEMA.copy()
-        sensor_payload["name"] = self._name
-        sensor_payload["state_topic"] = self._sensor_state_topic
-        sensor_payload["unique_id"] = self._sensor_mqtt_unique_id
-        sensor_payload["availability_topic"] = self._sensor_availability_topic
-        sensor_payload["device"] = self._device_block_for_mqtt
-        await self._publish_discovery(self._sensor_config_topic, sensor_payload)
+        # 2. Migrate legacy per-entity discovery (once per instance)
+        if not self._discovery_migrated:
+            await self._async_migrate_legacy_discovery()
 
-        # 3. Publish Discovery & Setup - Threshold Numbers (Conditional)
-        if self._create_threshold_entities:
-            _LOGGER.debug("[%s] Creating threshold number entities via MQTT discovery.", self.entry_id)
-            # Min Threshold Number (Renamed)
-            min_thresh_payload = DISCOVERY_PAYLOAD_NUMBER_SCHEMA.copy()
-            min_thresh_payload["name"] = f"{self._name} Min" 
-            min_thresh_payload["state_topic"] = self._min_thresh_state_topic
-            min_thresh_payload["command_topic"] = self._min_thresh_command_topic
-            min_thresh_payload["unique_id"] = self._min_thresh_mqtt_unique_id
-            min_thresh_payload["availability_topic"] = self._sensor_availability_topic
-            min_thresh_payload["device"] = self._device_block_for_mqtt
-            await self._publish_discovery(self._min_thresh_config_topic, min_thresh_payload)
-
-            # Max Threshold Number (Renamed)
-            max_thresh_payload = DISCOVERY_PAYLOAD_NUMBER_SCHEMA.copy()
-            max_thresh_payload["name"] = f"{self._name} Max" 
-            max_thresh_payload["state_topic"] = self._max_thresh_state_topic
-            max_thresh_payload["command_topic"] = self._max_thresh_command_topic
-            max_thresh_payload["unique_id"] = self._max_thresh_mqtt_unique_id
-            max_thresh_payload["availability_topic"] = self._sensor_availability_topic
-            max_thresh_payload["device"] = self._device_block_for_mqtt
-            await self._publish_discovery(self._max_thresh_config_topic, max_thresh_payload)
+        # 3. Publish Discovery - one device message for the sensor & threshold numbers
+        await self._publish_discovery(self._device_config_topic, self._build_device_discovery_payload())
+        if not self._discovery_migrated:
+            await self._async_clear_legacy_discovery()
 
+        # 4. Setup - Threshold Numbers (Conditional)
+        if self._create_threshold_entities:
+            # Start from the active scheduled thresholds so each state topic is published once
+            if self._day_thresholds is not None:
+                self._set_scheduled_thresholds(seconds_of_day(dt_util.now()))
             # Subscribe to Command Topics for Numbers
             self._listeners.append(
                 await mqtt.async_subscribe(
@@ -232,20 +295,78 @@ class VPDCalculatorMqttPublisher:
              _LOGGER.debug("[%s] Skipping threshold number entity creation.", self.entry_id)
 
 
-        # 4. Set up state listeners for input sensors (Always needed)
+        # 5. Join the shared boundary timer
+        if self._day_thresholds is not None:
+            async_get_schedule_manager(self.hass).async_register(self)
+
+        # 6. Set up state listeners for input sensors (Always needed)
         self._listeners.append(
             async_track_state_change_event(
                 self.hass, [self._temp_id, self._hum_id], self._handle_state_update_event
             )
         )
 
-        # 5. Get initial states and publish first state/availability (Always needed)
+        # 7. Get initial states and publish first state/availability (Always needed)
         self._update_initial_states()
         await self._update_and_publish_vpd()
 
         _LOGGER.info("[%s] Setup complete. MQTT entities configured (Thresholds: %s).", self.entry_id, self._create_threshold_entities)
 
 
+    # --- Discovery Helpers ---
+    def _build_device_discovery_payload(self) -> dict[str, Any]:
+        """Build the device-based discovery payload declaring all components of this instance."""
+        sensor_payload = DISCOVERY_PAYLOAD_SENSOR_SCHEMA.copy()
+        sensor_payload["name"] = self._name
+        sensor_payload["state_topic"] = self._sensor_state_topic
+        sensor_payload["unique_id"] = self._sensor_mqtt_unique_id
+        components: dict[str, dict[str, Any]] = {"vpd": sensor_payload}
+
+        if self._create_threshold_entities:
+            _LOGGER.debug("[%s] Creating threshold number entities via MQTT discovery.", self.entry_id)
+            min_thresh_payload = DISCOVERY_PAYLOAD_NUMBER_SCHEMA.copy()
+            min_thresh_payload["name"] = f"{self._name} Min"
+            min_thresh_payload["state_topic"] = self._min_thresh_state_topic
+            min_thresh_payload["command_topic"] = self._min_thresh_command_topic
+            min_thresh_payload["unique_id"] = self._min_thresh_mqtt_unique_id
+            components[CONF_KEY_MIN_THRESHOLD] = min_thresh_payload
+
+            max_thresh_payload = DISCOVERY_PAYLOAD_NUMBER_SCHEMA.copy()
+            max_thresh_payload["name"] = f"{self._name} Max"
+            max_thresh_payload["state_topic"] = self._max_thresh_state_topic
+            max_thresh_payload["command_topic"] = self._max_thresh_command_topic
+            max_thresh_payload["unique_id"] = self._max_thresh_mqtt_unique_id
+            components[CONF_KEY_MAX_THRESHOLD] = max_thresh_payload
+        else:
+            # A component with only its platform removes it if an earlier payload declared it
+            components[CONF_KEY_MIN_THRESHOLD] = {"platform": "number"}
+            components[CONF_KEY_MAX_THRESHOLD] = {"platform": "number"}
+
+        device_payload = DISCOVERY_PAYLOAD_DEVICE_SCHEMA.copy()
+        device_payload["device"] = self._device_block_for_mqtt
+        device_payload["availability_topic"] = self._sensor_availability_topic
+        device_payload["components"] = components
+        return device_payload
+
+    def _legacy_discovery_topics(self) -> tuple[str, ...]:
+        """Per-entity discovery topics published by earlier versions."""
+        return (self._sensor_config_topic, self._min_thresh_config_topic, self._max_thresh_config_topic)
+
+    async def _async_migrate_legacy_discovery(self) -> None:
+        """Ask HA to hand the legacy entities over to device discovery, keeping their registry entries."""
+        _LOGGER.debug("[%s] Migrating legacy per-entity discovery to %s", self.entry_id, self._device_config_topic)
+        for topic in self._legacy_discovery_topics():
+            await mqtt.async_publish(self.hass, topic, MIGRATE_DISCOVERY_PAYLOAD, qos=0, retain=True)
+
+    async def _async_clear_legacy_discovery(self) -> None:
+        """Remove the retained legacy discovery messages and remember that migration is done."""
+        for topic in self._legacy_discovery_topics():
+            await mqtt.async_publish(self.hass, topic, PAYLOAD_EMPTY, qos=0, retain=True)
+        self._discovery_migrated = True
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, data={**self.config_entry.data, CONF_KEY_DEVICE_DISCOVERY_MIGRATED: True}
+        )
+
     # --- Helper Methods (_publish_discovery, _publish_threshold_state same) ---
     async def _publish_discovery(self, config_topic: str, payload: dict) -> None:
         """Publish an MQTT discovery message."""
@@ -308,8 +429,9 @@ class VPDCalculatorMqttPublisher:
                  self._max_threshold = new_value
 
             # Persist change in config entry data
-            self.config_data[conf_key] = new_value
-            self.hass.config_entries.async_update_entry(self.config_entry, data=self.config_data)
+            self.hass.config_entries.async_update_entry(
+                self.config_entry, data={**self.config_entry.data, conf_key: new_value}
+            )
 
             # Publish the validated state back to MQTT state topic
             await self._publish_threshold_state(state_topic, new_value)
@@ -320,84 +442,153 @@ class VPDCalculatorMqttPublisher:
              _LOGGER.exception("[%s] Error handling threshold command on %s: %s", self.entry_id, msg.topic, e)
 
 
+    # --- Threshold Schedule Logic ---
+    def _configure_schedule(self, schedule_conf: dict[str, Any]) -> None:
+        """Reset the schedule and load it for the configured growth stage (if any)."""
+        self._growth_stage = schedule_conf.get(CONF_KEY_GROWTH_STAGE, GROWTH_STAGE_OFF)
+        self._lights_on = None
+        self._lights_off = None
+        self._day_thresholds = None
+        self._night_thresholds = None
+        if self._create_threshold_entities and self._growth_stage != GROWTH_STAGE_OFF:
+            self._load_schedule(schedule_conf)
+
+    async def async_update_schedule(self, config_entry: ConfigEntry) -> None:
+        """Apply changed schedule options in place, without reloading the entry."""
+        self.loaded_options = dict(config_entry.options)
+        manager = async_get_schedule_manager(self.hass)
+        manager.async_unregister(self.entry_id)
+        self._configure_schedule({**config_entry.data, **config_entry.options})
+        if self._day_thresholds is not None:
+            manager.async_register(self)
+            await self.async_apply_schedule(seconds_of_day(dt_util.now()))
+        _LOGGER.info("[%s] Schedule updated (Stage: %s)", self.entry_id, self._growth_stage)
+
+    def _load_schedule(self, schedule_conf: dict[str, Any]) -> None:
+        """Parse lights-on/off times and the day/night thresholds for the current growth stage."""
+        try:
+            lights_on, lights_off = parse_light_times(schedule_conf)
+            day, night = parse_stage_thresholds(schedule_conf, self._growth_stage)
+        except ValueError as e:
+            _LOGGER.error("[%s] Invalid VPD schedule for stage '%s', schedule disabled: %s", self.entry_id, self._growth_stage, e)
+            return
+        self._lights_on, self._lights_off = lights_on, lights_off
+        self._day_thresholds, self._night_thresholds = day, night
+        _LOGGER.debug("[%s] Schedule '%s' loaded (Day: %s, Night: %s)", self.entry_id, self._growth_stage, day, night)
+
+    @property
+    def schedule_boundaries(self) -> tuple[int, ...]:
+        """Seconds of the day at which the scheduled thresholds change."""
+        if self._day_thresholds is None:
+            return ()
+        return (self._lights_on, self._lights_off)
+
+    def _scheduled_thresholds(self, second_of_day: int) -> tuple[float, float]:
+        """Return the (min, max) thresholds active at the given second of the day."""
+        if self._lights_on < self._lights_off:
+            is_day = self._lights_on <= second_of_day < self._lights_off
+        else: # Lights-on period wraps past midnight
+            is_day = second_of_day >= self._lights_on or second_of_day < self._lights_off
+        return self._day_thresholds if is_day else self._night_thresholds
+
+    def _set_scheduled_thresholds(self, second_of_day: int) -> None:
+        """Set the internal thresholds for the given second of the day (no publish)."""
+        self._min_threshold, self._max_threshold = self._scheduled_thresholds(second_of_day)
+        _LOGGER.debug("[%s] Applying scheduled thresholds (Min: %s, Max: %s)", self.entry_id, self._min_threshold, self._max_threshold)
+
+    async def async_apply_schedule(self, second_of_day: int) -> None:
+        """Set the thresholds for the given second of the day and publish both states together."""
+        if self._day_thresholds is None:
+            return
+        self._set_scheduled_thresholds(second_of_day)
+        await asyncio.gather(
+            self._publish_threshold_state(self._min_thresh_state_topic, self._min_threshold),
+            self._publish_threshold_state(self._max_thresh_state_topic, self._max_threshold),
+        )
+
      # --- VPD Sensor State Update Logic ---
     def _update_initial_states(self) -> None:
         """Get initial states of source sensors."""
-        # (Same as before)
-        temp_state_obj = self.hass.states.get(self._temp_id)
-        hum_state_obj = self.hass.states.get(self._hum_id)
-        self._temp_state = None
-        self._hum_state = None
-        if temp_state_obj and temp_state_obj.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            try: self._temp_state = float(temp_state_obj.state)
-            except (ValueError, TypeError): pass
-        if hum_state_obj and hum_state_obj.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            try: self._hum_state = float(hum_state_obj.state)
-            except (ValueError, TypeError): pass
+        self._state.temp = _source_value(self.hass.states.get(self._temp_id))
+        self._state.hum = _source_value(self.hass.states.get(self._hum_id))
 
     @callback
     def _handle_state_update_event(self, event: Event) -> None:
-        """Handle state changes of source sensors and schedule VPD update."""
-        # (Modified slightly to only schedule VPD update)
-        new_state = event.data.get("new_state")
-        entity_id = event.data.get("entity_id")
-        _LOGGER.debug("[%s] State change detected for %s", self.entry_id, entity_id)
-
-        state_value = None
-        if new_state and new_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            try: state_value = float(new_state.state)
-            except (ValueError, TypeError): state_value = None
-
-        needs_update = False
-        if entity_id == self._temp_id and state_value != self._temp_state:
-            self._temp_state = state_value
-            needs_update = True
-        elif entity_id == self._hum_id and state_value != self._hum_state:
-            self._hum_state = state_value
-            needs_update = True
-
-        if needs_update:
-            self.hass.async_create_task(self._update_and_publish_vpd())
-
-    async def _update_and_publish_vpd(self) -> None:
-        """Calculate VPD and publish state and availability via MQTT."""
-        # (Same calculation logic as before)
-        old_available = self._available
-        old_vpd_state = self._vpd_state
-
-        if self._temp_state is None or self._hum_state is None:
-            self._available = False
-            self._vpd_state = None
+        """Handle state changes of source sensors; recalculate inline and publish only on change."""
+        data = event.data
+        entity_id = data["entity_id"]
+        state_value = _source_value(data["new_state"])
+        state = self._state
+
+        if entity_id == self._temp_id:
+            if state_value == state.temp:
+                return
+            state.temp = state_value
+        elif entity_id == self._hum_id:
+            if state_value == state.hum:
+                return
+            state.hum = state_value
+        else:
+            return
+
+        # Only spawn a publish task when the quantized output or availability actually moved
+        availability_payload, state_payload = self._calculate_vpd()
+        if availability_payload is not None or state_payload is not None:
+            self.hass.async_create_task(self._publish_vpd(availability_payload, state_payload))
+
+    def _calculate_vpd(self) -> tuple[bytes | None, bytes | None]:
+        """Recalculate VPD into the runtime state.
+
+        Returns the (availability, state) payloads to publish, None for each that didn't change.
+        They are resolved here so a publish task never reads state that changed after it was scheduled.
+        """
+        state = self._state
+        old_available = state.available
+        old_vpd_centi = state.vpd_centi
+        temperature = state.temp
+        humidity = state.hum
+
+        if temperature is None or humidity is None:
+            state.available = False
+            state.vpd_centi = None
         else:
-            # ... (VPD calculation) ...
             try:
-                temperature = self._temp_state
-                humidity = self._hum_state
                 t_leaf = temperature + self._delta
                 es_leaf = 0.61078 * math.exp((17.27 * t_leaf) / (t_leaf + 237.3))
                 es_air = 0.61078 * math.exp((17.27 * temperature) / (temperature + 237.3))
-                ea = (humidity / 100.0) * es_air
-                vpd = es_leaf - ea
-                self._vpd_state = round(max(0.0, vpd), 2)
-                self._available = True
+                vpd = es_leaf - (humidity / 100.0) * es_air
+                state.vpd_centi = round(vpd * 100) if vpd > 0.0 else 0
+                state.available = True
             except Exception as e:
                 _LOGGER.error("[%s] Error calculating VPD: %s", self.entry_id, e)
-                self._available = False
-                self._vpd_state = None
-
-        availability_changed = (old_available != self._available)
-        state_changed = (self._vpd_state != old_vpd_state) or (availability_changed and self._available)
+                state.available = False
+                state.vpd_centi = None
 
-        # Publish availability change (applies to sensor and numbers)
+        availability_changed = old_available != state.available
+        availability_payload = None
         if availability_changed:
-            payload = "online" if self._available else "offline"
-            _LOGGER.debug("[%s] Publishing availability to %s: %s", self.entry_id, self._sensor_availability_topic, payload)
-            await mqtt.async_publish(self.hass, self._sensor_availability_topic, payload, qos=0, retain=True)
+            availability_payload = PAYLOAD_ONLINE_BYTES if state.available else PAYLOAD_OFFLINE_BYTES
+        state_payload = None
+        if state.available and (state.vpd_centi != old_vpd_centi or availability_changed):
+            state_payload = _kpa_payload(state.vpd_centi)
+        return availability_payload, state_payload
+
+    async def _publish_vpd(self, availability_payload: bytes | None, state_payload: bytes | None) -> None:
+        """Publish the availability and/or VPD state payloads resolved by _calculate_vpd."""
+        # Publish availability change (applies to sensor and numbers)
+        if availability_payload is not None:
+            _LOGGER.debug("[%s] Publishing availability to %s: %s", self.entry_id, self._sensor_availability_topic, availability_payload)
+            await mqtt.async_publish(self.hass, self._sensor_availability_topic, availability_payload, qos=0, retain=True)
 
         # Publish VPD sensor state change
-        if self._available and state_changed:
-            _LOGGER.debug("[%s] Publishing VPD state to %s: %s", self.entry_id, self._sensor_state_topic, self._vpd_state)
-            await mqtt.async_publish(self.hass, self._sensor_state_topic, str(self._vpd_state), qos=0, retain=True)
+        if state_payload is not None:
+            _LOGGER.debug("[%s] Publishing VPD state to %s: %s", self.entry_id, self._sensor_state_topic, state_payload)
+            await mqtt.async_publish(self.hass, self._sensor_state_topic, state_payload, qos=0, retain=True)
+
+    async def _update_and_publish_vpd(self) -> None:
+        """Calculate VPD and publish state and availability via MQTT."""
+        availability_payload, state_payload = self._calculate_vpd()
+        await self._publish_vpd(availability_payload, state_payload)
 
 
     # --- Unload Logic ---
@@ -405,14 +596,13 @@ class VPDCalculatorMqttPublisher:
         """Clean up resources."""
         _LOGGER.debug("[%s] Unloading", self.entry_id)
 
-        # Publish empty discovery messages for all entities that *might* have been created
-        await mqtt.async_publish(self.hass, self._sensor_config_topic, "", qos=0, retain=False)
-        if self._create_threshold_entities: # Only clear number discovery if they were created
-             await mqtt.async_publish(self.hass, self._min_thresh_config_topic, "", qos=0, retain=False) # Use renamed topic
-             await mqtt.async_publish(self.hass, self._max_thresh_config_topic, "", qos=0, retain=False) # Use renamed topic
+        # Leave the shared schedule timer (no-op if this instance has no schedule)
+        async_get_schedule_manager(self.hass).async_unregister(self.entry_id)
+
+        # Discovery stays retained so a reload keeps the entities; async_remove_entry clears it
 
         # Clear retained availability message (always clear this)
-        await mqtt.async_publish(self.hass, self._sensor_availability_topic, "", qos=0, retain=True)
+        await mqtt.async_publish(self.hass, self._sensor_availability_topic, PAYLOAD_EMPTY, qos=0, retain=True)
 
         # Stop listeners (includes MQTT subscriptions which were conditional)
         for remove_listener in self._listeners:
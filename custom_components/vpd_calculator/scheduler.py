@@ -0,0 +1,170 @@
+"""Schedule parsing and the shared timer that applies VPD thresholds at lights-on/lights-off boundaries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_SCHEDULER,
+    CONF_KEY_MIN_THRESHOLD,
+    CONF_KEY_MAX_THRESHOLD,
+    CONF_KEY_LIGHTS_ON,
+    CONF_KEY_LIGHTS_OFF,
+    CONF_KEY_SCHEDULE,
+    DEFAULT_LIGHTS_ON,
+    DEFAULT_LIGHTS_OFF,
+    DEFAULT_VPD_SCHEDULE,
+    DEFAULT_THRESHOLD_MIN_LIMIT,
+    DEFAULT_THRESHOLD_MAX_LIMIT,
+)
+
+if TYPE_CHECKING:
+    from .mqtt_publisher import VPDCalculatorMqttPublisher
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+_ENTRY_ID_MAX = "\uffff" # Sorts after any entry_id, for bisecting on a whole second
+
+
+def parse_time_of_day(value: str) -> int:
+    """Convert an 'HH:MM[:SS]' string (as returned by the time selector) to seconds of the day."""
+    parts = [int(part) for part in str(value).split(":")]
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"Invalid time '{value}'")
+    hours, minutes, seconds = (parts + [0])[:3]
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ValueError(f"Invalid time '{value}'")
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def parse_threshold_pair(slot: dict[str, Any]) -> tuple[float, float]:
+    """Validate one schedule slot and return its (min, max) thresholds."""
+    min_val = float(slot[CONF_KEY_MIN_THRESHOLD])
+    max_val = float(slot[CONF_KEY_MAX_THRESHOLD])
+    if not (DEFAULT_THRESHOLD_MIN_LIMIT <= min_val < max_val <= DEFAULT_THRESHOLD_MAX_LIMIT):
+        raise ValueError(f"Thresholds {min_val}/{max_val} outside range [{DEFAULT_THRESHOLD_MIN_LIMIT}-{DEFAULT_THRESHOLD_MAX_LIMIT}] or min >= max")
+    return min_val, max_val
+
+
+def parse_light_times(conf: dict[str, Any]) -> tuple[int, int]:
+    """Return (lights_on, lights_off) as seconds of the day; raise ValueError if invalid."""
+    lights_on = parse_time_of_day(conf.get(CONF_KEY_LIGHTS_ON, DEFAULT_LIGHTS_ON))
+    lights_off = parse_time_of_day(conf.get(CONF_KEY_LIGHTS_OFF, DEFAULT_LIGHTS_OFF))
+    if lights_on == lights_off:
+        raise ValueError("lights on and lights off must differ")
+    return lights_on, lights_off
+
+
+def parse_stage_thresholds(
+    conf: dict[str, Any], stage: str
+) -> tuple[tuple[float, float], tuple[float, float]]:
+    """Return the (day, night) threshold pairs for a growth stage; raise ValueError if invalid."""
+    try:
+        slots = (conf.get(CONF_KEY_SCHEDULE) or DEFAULT_VPD_SCHEDULE)[stage]
+        return parse_threshold_pair(slots["day"]), parse_threshold_pair(slots["night"])
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Missing or malformed schedule entry for stage '{stage}': {e}") from e
+
+
+def seconds_of_day(moment: datetime) -> int:
+    """Return the local wall-clock second of the day for a datetime."""
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+@callback
+def async_get_schedule_manager(hass: HomeAssistant) -> VPDScheduleManager:
+    """Return the domain-wide schedule manager, creating it on first use."""
+    manager = hass.data.get(DATA_SCHEDULER)
+    if manager is None:
+        manager = hass.data[DATA_SCHEDULER] = VPDScheduleManager(hass)
+    return manager
+
+
+class VPDScheduleManager:
+    """Keeps a sorted boundary index for all instances and one timer for the next boundary."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        # Sorted (second_of_day, entry_id) pairs, one per boundary per instance
+        self._index: list[tuple[int, str]] = []
+        self._publishers: dict[str, VPDCalculatorMqttPublisher] = {}
+        self._unsub_timer: Callable[[], None] | None = None
+        self._next_second: int | None = None
+
+    @callback
+    def async_register(self, publisher: VPDCalculatorMqttPublisher) -> None:
+        """Add an instance's boundaries to the index and re-arm the timer."""
+        entry_id = publisher.entry_id
+        if entry_id in self._publishers:
+            self.async_unregister(entry_id)
+        self._publishers[entry_id] = publisher
+        for second in publisher.schedule_boundaries:
+            insort(self._index, (second, entry_id))
+        _LOGGER.debug("[%s] Registered schedule boundaries: %s", entry_id, publisher.schedule_boundaries)
+        self._schedule_next()
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Drop an instance's boundaries from the index and re-arm (or stop) the timer."""
+        if self._publishers.pop(entry_id, None) is None:
+            return
+        self._index = [item for item in self._index if item[1] != entry_id]
+        _LOGGER.debug("[%s] Unregistered schedule boundaries", entry_id)
+        self._schedule_next()
+
+    @callback
+    def _schedule_next(self) -> None:
+        """Arm a single timer for the next boundary across all instances."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._next_second = None
+        if not self._index:
+            return
+
+        now = dt_util.now()
+        # Bisecting past (now, _ENTRY_ID_MAX) skips boundaries at the current second
+        pos = bisect_right(self._index, (seconds_of_day(now), _ENTRY_ID_MAX))
+        if pos < len(self._index):
+            next_second = self._index[pos][0]
+            offset = next_second
+        else:
+            next_second = self._index[0][0]
+            offset = next_second + SECONDS_PER_DAY
+        fire_at = dt_util.start_of_local_day(now) + timedelta(seconds=offset)
+
+        self._next_second = next_second
+        self._unsub_timer = async_track_point_in_time(self.hass, self._handle_boundary, fire_at)
+        _LOGGER.debug("Next VPD schedule boundary at %s", fire_at)
+
+    async def _handle_boundary(self, now: datetime) -> None:
+        """Apply the new thresholds for every instance sharing the boundary in one batch."""
+        self._unsub_timer = None
+        second = self._next_second
+        if second is None:
+            return
+
+        start = bisect_left(self._index, (second, ""))
+        end = bisect_right(self._index, (second, _ENTRY_ID_MAX))
+        entry_ids = {entry_id for _, entry_id in self._index[start:end]}
+        # Re-arm before awaiting so a slow publish never delays the following boundary
+        self._schedule_next()
+
+        publishers = [self._publishers[entry_id] for entry_id in entry_ids if entry_id in self._publishers]
+        _LOGGER.debug("VPD schedule boundary reached, updating %d instance(s)", len(publishers))
+        results = await asyncio.gather(
+            *(publisher.async_apply_schedule(second) for publisher in publishers),
+            return_exceptions=True,
+        )
+        for publisher, result in zip(publishers, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("[%s] Error applying scheduled thresholds: %s", publisher.entry_id, result)
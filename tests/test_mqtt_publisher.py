@@ -0,0 +1,116 @@
+"""Tests for the VPD publisher hot path."""
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from custom_components.vpd_calculator import mqtt_publisher
+from custom_components.vpd_calculator.mqtt_publisher import (
+    PAYLOAD_OFFLINE_BYTES,
+    PAYLOAD_ONLINE_BYTES,
+    VPDCalculatorMqttPublisher,
+    _kpa_payload,
+)
+
+TEMP_ID = "sensor.tent_temperature"
+HUM_ID = "sensor.tent_humidity"
+
+
+def _make_publisher() -> VPDCalculatorMqttPublisher:
+    entry = SimpleNamespace(
+        entry_id="test_entry",
+        data={
+            "name": "Tent VPD",
+            "temp_sensor": TEMP_ID,
+            "humidity_sensor": HUM_ID,
+            "leaf_delta": 0.0,
+        },
+        options={},
+    )
+    return VPDCalculatorMqttPublisher(MagicMock(), entry)
+
+
+def _event(entity_id: str, value: str) -> SimpleNamespace:
+    return SimpleNamespace(data={"entity_id": entity_id, "new_state": SimpleNamespace(state=value)})
+
+
+def test_calculate_vpd_resolves_payloads() -> None:
+    publisher = _make_publisher()
+    publisher._state.temp = 25.0
+    publisher._state.hum = 60.0
+
+    assert publisher._calculate_vpd() == (PAYLOAD_ONLINE_BYTES, b"1.27")
+    # Nothing changed, nothing to publish
+    assert publisher._calculate_vpd() == (None, None)
+
+    publisher._state.hum = None
+    assert publisher._calculate_vpd() == (PAYLOAD_OFFLINE_BYTES, None)
+
+
+def test_state_event_schedules_publish_only_on_change() -> None:
+    publisher = _make_publisher()
+    create_task = publisher.hass.async_create_task
+
+    publisher._handle_state_update_event(_event(TEMP_ID, "25.0"))
+    assert not create_task.called # Humidity still unknown, availability unchanged
+
+    publisher._handle_state_update_event(_event(HUM_ID, "60.0"))
+    assert create_task.call_count == 1
+    create_task.call_args.args[0].close()
+
+    # Same quantized VPD (1.27 kPa), no new task
+    publisher._handle_state_update_event(_event(HUM_ID, "60.001"))
+    assert create_task.call_count == 1
+
+
+def test_kpa_payload_cache_is_bounded() -> None:
+    mqtt_publisher._KPA_PAYLOAD_CACHE.clear()
+    assert _kpa_payload(85) == b"0.85"
+    assert _kpa_payload(0) == b"0.0"
+    assert _kpa_payload(10_000_000) == b"100000.0"
+    assert set(mqtt_publisher._KPA_PAYLOAD_CACHE) == {0, 85}
+
+
+def test_state_event_allocations_are_bounded() -> None:
+    publisher = _make_publisher()
+    tasks = [0]
+
+    def create_task(coro) -> None:
+        # Close publish coroutines right away; a MagicMock would keep every call in memory
+        coro.close()
+        tasks[0] += 1
+
+    publisher.hass = SimpleNamespace(async_create_task=create_task)
+    publisher._handle_state_update_event(_event(HUM_ID, "55.0"))
+
+    events = []
+    for step in range(50):
+        temperature = _event(TEMP_ID, f"{20 + step / 2:.1f}")
+        events.append(temperature) # Changes the quantized VPD: publish task
+        events.append(temperature) # Same value again: early return
+        events.append(_event(TEMP_ID, f"{20 + step / 2:.1f}01")) # New value, same 0.01 kPa: no task
+        events.append(_event(HUM_ID, "55.0")) # Unchanged humidity: early return
+
+    def run_events() -> None:
+        for event in events:
+            publisher._handle_state_update_event(event)
+
+    run_events() # Warm the payload cache
+    tasks[0] = 0
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(50):
+            run_events()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert tasks[0] == 50 * 50 # Exactly one publish task per quantized change
+    # 10,000 events: nothing retained, and the transient peak stays at a couple of objects per event
+    assert after - before < 1024
+    assert peak - before < 2048
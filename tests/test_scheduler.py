@@ -0,0 +1,155 @@
+"""Tests for schedule parsing, the shared boundary timer and day/night selection."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.vpd_calculator import scheduler
+from custom_components.vpd_calculator.mqtt_publisher import VPDCalculatorMqttPublisher
+from custom_components.vpd_calculator.scheduler import (
+    VPDScheduleManager,
+    parse_light_times,
+    parse_stage_thresholds,
+    parse_time_of_day,
+)
+
+
+@pytest.fixture
+def timer(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Freeze the clock and record the timers the manager arms."""
+    clock = SimpleNamespace(now=datetime(2026, 10, 18, 12, 0, 0), armed=[])
+
+    def track_point_in_time(hass, action, point):
+        clock.armed.append(point)
+        return MagicMock()
+
+    monkeypatch.setattr(scheduler, "dt_util", SimpleNamespace(
+        now=lambda: clock.now,
+        start_of_local_day=lambda moment: moment.replace(hour=0, minute=0, second=0, microsecond=0),
+    ))
+    monkeypatch.setattr(scheduler, "async_track_point_in_time", track_point_in_time)
+    return clock
+
+
+def _fake_publisher(entry_id: str, *boundaries: int) -> SimpleNamespace:
+    return SimpleNamespace(entry_id=entry_id, schedule_boundaries=boundaries, async_apply_schedule=AsyncMock())
+
+
+def test_parse_time_of_day() -> None:
+    assert parse_time_of_day("06:00:00") == 21600
+    assert parse_time_of_day("18:30") == 66600
+    for value in ("24:00", "12:60", "12", "1:2:3:4", "noon", None):
+        with pytest.raises(ValueError):
+            parse_time_of_day(value)
+
+
+def test_parse_light_times_rejects_equal_times() -> None:
+    assert parse_light_times({"lights_on": "18:00:00", "lights_off": "06:00:00"}) == (64800, 21600)
+    with pytest.raises(ValueError):
+        parse_light_times({"lights_on": "06:00:00", "lights_off": "06:00"})
+
+
+def test_parse_stage_thresholds() -> None:
+    assert parse_stage_thresholds({}, "vegetative") == ((0.8, 1.1), (0.6, 0.9))
+    bad_schedules = (
+        {"vpd_schedule": {"vegetative": {"day": {"min_vpd": 0.8, "max_vpd": 1.1}}}}, # No night slot
+        {"vpd_schedule": {"vegetative": "not a mapping"}},
+        {"vpd_schedule": {"vegetative": {"day": {"min_vpd": 1.2, "max_vpd": 1.1}, "night": {"min_vpd": 0.6, "max_vpd": 0.9}}}},
+        {"vpd_schedule": {"vegetative": {"day": {"min_vpd": 0.8, "max_vpd": 9.0}, "night": {"min_vpd": 0.6, "max_vpd": 0.9}}}},
+        {"vpd_schedule": {"vegetative": {"day": {"min_vpd": "x", "max_vpd": 1.1}, "night": {"min_vpd": 0.6, "max_vpd": 0.9}}}},
+    )
+    for conf in bad_schedules:
+        with pytest.raises(ValueError):
+            parse_stage_thresholds(conf, "vegetative")
+    with pytest.raises(ValueError):
+        parse_stage_thresholds({}, "unknown_stage")
+
+
+def test_manager_arms_next_boundary(timer: SimpleNamespace) -> None:
+    manager = VPDScheduleManager(MagicMock())
+    manager.async_register(_fake_publisher("e1", 0, 21600))
+    manager.async_register(_fake_publisher("e2", 21600, 64800))
+    # Noon: the next boundary is 18:00 today
+    assert timer.armed[-1] == datetime(2026, 10, 18, 18, 0, 0)
+    assert manager._next_second == 64800
+
+
+def test_manager_wraps_to_next_day(timer: SimpleNamespace) -> None:
+    timer.now = datetime(2026, 10, 18, 20, 0, 0)
+    manager = VPDScheduleManager(MagicMock())
+    manager.async_register(_fake_publisher("e1", 0, 21600))
+    manager.async_register(_fake_publisher("e2", 21600, 64800))
+    assert timer.armed[-1] == datetime(2026, 10, 19, 0, 0, 0)
+    assert manager._next_second == 0
+
+
+def test_manager_skips_boundary_at_current_second(timer: SimpleNamespace) -> None:
+    timer.now = datetime(2026, 10, 18, 6, 0, 0)
+    manager = VPDScheduleManager(MagicMock())
+    manager.async_register(_fake_publisher("e1", 21600, 64800))
+    assert timer.armed[-1] == datetime(2026, 10, 18, 18, 0, 0)
+
+
+def test_boundary_updates_all_instances_sharing_the_second(timer: SimpleNamespace) -> None:
+    timer.now = datetime(2026, 10, 18, 5, 0, 0)
+    manager = VPDScheduleManager(MagicMock())
+    first = _fake_publisher("e1", 0, 21600)
+    second = _fake_publisher("e2", 21600, 64800)
+    third = _fake_publisher("e3", 3600, 64800)
+    for publisher in (first, second, third):
+        manager.async_register(publisher)
+    assert manager._next_second == 21600
+
+    timer.now = datetime(2026, 10, 18, 6, 0, 0)
+    asyncio.run(manager._handle_boundary(timer.now))
+    first.async_apply_schedule.assert_awaited_once_with(21600)
+    second.async_apply_schedule.assert_awaited_once_with(21600)
+    third.async_apply_schedule.assert_not_awaited()
+    # Re-armed for the following boundary
+    assert timer.armed[-1] == datetime(2026, 10, 18, 18, 0, 0)
+
+
+def test_unregister_stops_timer_when_index_empty(timer: SimpleNamespace) -> None:
+    manager = VPDScheduleManager(MagicMock())
+    manager.async_register(_fake_publisher("e1", 0, 21600))
+    unsub = manager._unsub_timer
+    manager.async_unregister("e1")
+    unsub.assert_called_once()
+    assert manager._unsub_timer is None
+    assert manager._index == []
+
+
+def _scheduled_publisher(lights_on: str, lights_off: str) -> VPDCalculatorMqttPublisher:
+    entry = SimpleNamespace(
+        entry_id="test_entry",
+        data={
+            "name": "Tent VPD",
+            "temp_sensor": "sensor.tent_temperature",
+            "humidity_sensor": "sensor.tent_humidity",
+            "leaf_delta": 0.0,
+        },
+        options={"growth_stage": "vegetative", "lights_on": lights_on, "lights_off": lights_off},
+    )
+    return VPDCalculatorMqttPublisher(MagicMock(), entry)
+
+
+def test_scheduled_thresholds_day_and_night() -> None:
+    publisher = _scheduled_publisher("06:00:00", "18:00:00")
+    assert publisher.schedule_boundaries == (21600, 64800)
+    assert publisher._scheduled_thresholds(21600) == (0.8, 1.1)
+    assert publisher._scheduled_thresholds(64799) == (0.8, 1.1)
+    assert publisher._scheduled_thresholds(64800) == (0.6, 0.9)
+    assert publisher._scheduled_thresholds(0) == (0.6, 0.9)
+
+
+def test_scheduled_thresholds_lights_on_across_midnight() -> None:
+    publisher = _scheduled_publisher("18:00:00", "06:00:00")
+    assert publisher._scheduled_thresholds(64800) == (0.8, 1.1)
+    assert publisher._scheduled_thresholds(0) == (0.8, 1.1)
+    assert publisher._scheduled_thresholds(21599) == (0.8, 1.1)
+    assert publisher._scheduled_thresholds(21600) == (0.6, 0.9)
+    assert publisher._scheduled_thresholds(43200) == (0.6, 0.9)